@@ -9,7 +9,8 @@ Readme:
 #!/usr/bin/python3
 import time
 import os
-import copy
+import sys
+import math
 from heapq import heappush, heappop
 
 try:
@@ -19,59 +20,44 @@ except ImportError:  # try to install requests module if not present
     os.system('sudo python -m pip install psutil')
 import psutil
 
+from PuzzleSolver_Board import BoardEncoding, BoardInput, BoardShape
+from PuzzleSolver_PatternDB import PatternDatabase
+from PuzzleSolver_Stats import SearchStatistics
+
 #All variables are passed by reference in Python
 class AStar:
 	'This class contains an implementation of the Breadth-First Search algorithm'
-	
-	def moveBlank(heuristic, node, action, goalTilePos):
+
+	def moveBlank(heuristic, node, action):
 		'''
-		This function swaps the blank cell and the nearby cell based on the action given in input argument
+		This function slides the tile next to the blank, in the direction given by the action, into the blank cell
 		It also updates the heuristic function
-		It returns a new child node with the new configuration
-		'''
-		#to retain the original reference to a node, this temporary node is created
-		tNode = PuzzleBoardNode(copy.deepcopy(node.puzzleBoard), node, action, XYPos(node.blankPosition.x, node.blankPosition.y), node.moveCost, node.manhattanDistance)
-		if(action == 0):
-			#Left
-			if(tNode.blankPosition.y > 0):				
-				tNode.blankPosition.y -= 1
-				tNode.moveCost += 1
-		elif(action == 1):
-			#Right
-			if(tNode.blankPosition.y < (len(tNode.puzzleBoard[0]) - 1)):
-				tNode.blankPosition.y += 1
-				tNode.moveCost += 1
-		elif(action == 2):
-			#Up
-			if(tNode.blankPosition.x > 0):
-				tNode.blankPosition.x -= 1
-				tNode.moveCost += 1
-		elif(action == 3):
-			#Down
-			if(tNode.blankPosition.x < (len(tNode.puzzleBoard) - 1)):
-				tNode.blankPosition.x += 1
-				tNode.moveCost += 1
+		It returns a new child node with the new configuration, or None if the action would take the blank off the board
+		'''
+		#the board of the parent is never copied, the child gets a new packed state with the one tile moved
+		shape = node.shape
+		newBlankIndex = shape.neighborCell[node.blankIndex][action]
+		if(newBlankIndex == -1):
+			return None
+		tile = BoardEncoding.tileAt(node.state, newBlankIndex, shape.bits)
+		tNode = PuzzleBoardNode(BoardEncoding.moveTile(node.state, tile, newBlankIndex, node.blankIndex, shape.bits), shape, node, action, newBlankIndex,
+									node.moveCost + 1, node.manhattanDistance)
 
 		#if the heuristic used is Manhattan, then update the distance value.
 		if(heuristic == 'Manhattan'):
-			AStar.updateManhattanDistance(tNode, tNode.puzzleBoard[tNode.blankPosition.x][tNode.blankPosition.y], goalTilePos,
-									tNode.blankPosition.x, tNode.blankPosition.y, node.blankPosition.x, node.blankPosition.y )
-
-		#swap the nearby value cell and the blank cell
-		tNode.puzzleBoard[node.blankPosition.x][node.blankPosition.y] = tNode.puzzleBoard[tNode.blankPosition.x][tNode.blankPosition.y]
-		tNode.puzzleBoard[tNode.blankPosition.x][tNode.blankPosition.y] = -1
+			AStar.updateManhattanDistance(tNode, tile, newBlankIndex, node.blankIndex)
 
 		#if the heuristic used is Displaced Tiles, then update the number of tiles displaced.
 		if(heuristic == 'DisplacedTiles'):
-			AStar.updateDisplacedTiles(tNode, goalTilePos)
+			AStar.updateDisplacedTiles(tNode)
 
 		return tNode
 
-	def isNodeInFrontier(tNode, frontierList):
+	def isNodeInFrontier(tNode, openList):
 		'''
-		This method returns if the given node is present or not in the frontier list
+		This method returns if the given node is present or not in the frontier, using the state index of the open list
 		'''
-		return tNode in frontierList
+		return tNode in openList
 
 	def traceSolution(solution, tNode):
 		'''
@@ -82,78 +68,87 @@ class AStar:
 			solution.append(tNode.actionTaken)
 			AStar.traceSolution(solution, tNode.parentNode)
 
-	def updateDisplacedTiles(node, goalTilePos):
+	def updateDisplacedTiles(node):
 		'''
 		This method counts the number of displaced tiles on the board and updates the count in the node
 		'''
-		for i in range(4):
-			for j in range(4):
-				if(node.puzzleBoard[i][j] != -1):
-					if(goalTilePos[node.puzzleBoard[i][j]][0] != i or goalTilePos[node.puzzleBoard[i][j]][1] != j):
-						node.numDisplacedTiles += 1
-
-	def updateManhattanDistance(node, tile, goalTilePos, oldX, oldY, newX, newY):
+		state = node.state
+		mask = (1 << node.shape.bits) - 1
+		goalCell = node.shape.goalCell
+		for cell in range(node.shape.numCells):
+			tile = state & mask
+			if(tile != 0 and goalCell[tile] != cell):
+				node.numDisplacedTiles += 1
+			state >>= node.shape.bits
+
+	def updateManhattanDistance(node, tile, oldCell, newCell):
 		'''
 		This method updates the Manhattan Distance after each move of a tile and updates the node
+		The distances come from the Manhattan lookup table of the board size, which is 0 for the blank
 		'''
-		if(tile != -1):
-			oldMDist = abs(goalTilePos[tile][0] - oldX) + abs(goalTilePos[tile][1] - oldY)
-			newMDist = abs(goalTilePos[tile][0] - newX) + abs(goalTilePos[tile][1] - newY)
-			node.manhattanDistance += (newMDist - oldMDist)
+		tileDistance = node.shape.manhattanTable[tile]
+		node.manhattanDistance += tileDistance[newCell] - tileDistance[oldCell]
 
-	def calculateManhattanDistance(node, goalTilePos):
+	def calculateManhattanDistance(node):
 		'''
 		This method calculates the manhattan distance of the initial configuration of the board
 		'''
-		for i in range(4):
-			for j in range(4):
-				if(node.puzzleBoard[i][j] != -1):
-					x, y = goalTilePos[node.puzzleBoard[i][j]]
-					node.manhattanDistance += abs(x - i) + abs(y - j)
+		for cell in range(node.shape.numCells):
+			tile = BoardEncoding.tileAt(node.state, cell, node.shape.bits)
+			node.manhattanDistance += node.shape.manhattanTable[tile][cell]
 
 
-	def aStarDisplTiles(puzzleBoardNode, goalNode, goalTilePos, actions):
+	def aStarDisplTiles(puzzleBoardNode, goalNode, actions, verbose = True):
 		'''
 			This method takes the complete initial state of the puzzle board (the root) as the argument. It uses the number of displaced tiles as the heuristics.
-			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state and some time/memory statistics. 
+			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state, some time/memory statistics
+			and the SearchStatistics of the run. 
 		'''
 		solution = []
-		exploredNodesSet = [] #Explored node list
-		frontierList = [] #this is to implement a priority Queue
-		heappush(frontierList, (puzzleBoardNode.moveCost + puzzleBoardNode.numDisplacedTiles, puzzleBoardNode)) #Enqueue operation
+		statistics = SearchStatistics('displacedtiles', 'cost')
+		statistics.startTimers()
+		openList = OpenList() #priority queue with a hashed index of the frontier and a hashed explored set
+		openList.push(puzzleBoardNode, puzzleBoardNode.numDisplacedTiles) #Enqueue operation
 		time1 = time.time() #start time
 		try:
-			while(len(frontierList) != 0):
-				totalCost, node = heappop(frontierList) #this is the dequeue operation on the FIFO queue
-				exploredNodesSet.append(node) #node to be explored now is added to the explored list
+			while(len(openList) != 0):
+				clock1 = time.perf_counter()
+				node = openList.pop() #dequeues the node with the lowest total cost and adds it to the explored set
+				statistics.queueTime += time.perf_counter() - clock1
+				if(openList.lastCost != statistics.layerKey):
+					statistics.enterLayer(openList.lastCost)
 
 				#Goal test
 				if(node == goalNode):
-					print('Goal Found')
-					node.print()
+					if(verbose):
+						print('Goal Found')
+						node.print()
 					AStar.traceSolution(solution, node)
 					break
 
-				flag = 0
-
-				#Branching point
+				#Branching point - the children are generated, evaluated and queued in separate passes, so that each pass is timed as a whole
+				clock1 = time.perf_counter()
+				children = []
 				for action in actions:
-					tNode =  AStar.moveBlank('DisplacedTiles', node, action, goalTilePos) #since its pass by reference, need to maintain the ref to original node
-
-					#Check to remove repeated states
-					if((tNode not in exploredNodesSet) and (not AStar.isNodeInFrontier((tNode.moveCost + tNode.numDisplacedTiles, tNode), frontierList))):
-						#Goal test
-						if(tNode == goalNode):
-							print('Goal Found')
-							tNode.print()
-							AStar.traceSolution(solution, tNode)
-							flag = 1
-							break
-						else:
-							heappush(frontierList, (tNode.moveCost + tNode.numDisplacedTiles, tNode)) #add the new node generated to the frontier if its not a list
-
-				if(flag):
-					break #exit the while loop if a solution is found
+					tNode =  AStar.moveBlank(None, node, action) #since its pass by reference, need to maintain the ref to original node
+					if(tNode is not None): #None if the blank is on the edge of the board
+						children.append(tNode)
+				clock2 = time.perf_counter()
+				for tNode in children:
+					AStar.updateDisplacedTiles(tNode)
+				clock3 = time.perf_counter()
+				for tNode in children:
+					#Repeated states are dropped by the open list - explored states and states already queued at the same or a lower move cost
+					if(not openList.push(tNode, tNode.numDisplacedTiles)):
+						statistics.nodesDeduplicated += 1
+				clock4 = time.perf_counter()
+				statistics.moveTime += clock2 - clock1
+				statistics.heuristicTime += clock3 - clock2
+				statistics.queueTime += clock4 - clock3
+				statistics.nodesExpanded += 1
+				statistics.nodesGenerated += len(children)
+				if(len(openList) > statistics.peakFrontier):
+					statistics.peakFrontier = len(openList)
 
 		except MemoryError:
 			print('Failure - Ran out of memory!')
@@ -163,52 +158,130 @@ class AStar:
 			process = psutil.Process(os.getpid())
 			pMemoryUsed = process.memory_info().rss/1000000 #This retrieves the physical memory allocated
 			vMemoryUsed = process.memory_info().vms/1000000 #This retrieves the virtual memory allocated
+			statistics.peakClosed = len(openList.exploredSet)
+			statistics.finish(pMemoryUsed)
 			
-		return (solution, runningTime, pMemoryUsed, vMemoryUsed)
+		return (solution, runningTime, pMemoryUsed, vMemoryUsed, statistics)
 
 
-	def aStarManhattan(puzzleBoardNode, goalNode, goalTilePos, actions):
+	def aStarManhattan(puzzleBoardNode, goalNode, actions, verbose = True):
 		'''
 			This method takes the complete initial state of the puzzle board (the root) as the argument. It uses the Manhattan Distance as the heuristics.
-			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state and some time/memory statistics. 
+			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state, some time/memory statistics
+			and the SearchStatistics of the run. 
 		'''
 		solution = []
-		exploredNodesSet = [] #Explored node list
-		frontierList = [] #this is to implement a priority Queue
-		heappush(frontierList, (puzzleBoardNode.moveCost + puzzleBoardNode.manhattanDistance, puzzleBoardNode)) #Enqueue operation
+		statistics = SearchStatistics('astar', 'cost')
+		statistics.startTimers()
+		openList = OpenList() #priority queue with a hashed index of the frontier and a hashed explored set
+		openList.push(puzzleBoardNode, puzzleBoardNode.manhattanDistance) #Enqueue operation
 		time1 = time.time() #start time
 		try:
-			while(len(frontierList) != 0):
-				totalCost, node = heappop(frontierList) #this is the dequeue operation on the FIFO queue
-				exploredNodesSet.append(node) #node to be explored now is added to the explored set
+			while(len(openList) != 0):
+				clock1 = time.perf_counter()
+				node = openList.pop() #dequeues the node with the lowest total cost and adds it to the explored set
+				statistics.queueTime += time.perf_counter() - clock1
+				if(openList.lastCost != statistics.layerKey):
+					statistics.enterLayer(openList.lastCost)
 
 				#Goal test
 				if(node == goalNode):
-					print('Goal Found')
-					node.print()
+					if(verbose):
+						print('Goal Found')
+						node.print()
 					AStar.traceSolution(solution, node)
 					break
 
-				flag = 0
+				#Branching point - the children are generated, evaluated and queued in separate passes, so that each pass is timed as a whole
+				clock1 = time.perf_counter()
+				children = []
+				for action in actions:
+					tNode =  AStar.moveBlank('Manhattan', node, action) #since its pass by reference, need to maintain the ref to original node
+					if(tNode is not None): #None if the blank is on the edge of the board
+						children.append(tNode)
+				#the Manhattan distance is updated by moveBlank along with the move, so it is timed as move generation
+				clock2 = clock3 = time.perf_counter()
+				for tNode in children:
+					#Repeated states are dropped by the open list - explored states and states already queued at the same or a lower move cost
+					if(not openList.push(tNode, tNode.manhattanDistance)):
+						statistics.nodesDeduplicated += 1
+				clock4 = time.perf_counter()
+				statistics.moveTime += clock2 - clock1
+				statistics.heuristicTime += clock3 - clock2
+				statistics.queueTime += clock4 - clock3
+				statistics.nodesExpanded += 1
+				statistics.nodesGenerated += len(children)
+				if(len(openList) > statistics.peakFrontier):
+					statistics.peakFrontier = len(openList)
+
+		except MemoryError:
+			print('Failure - Ran out of memory!')
+		else:
+			time2 = time.time()
+			runningTime = (time2 - time1) #calculates the elapsed time
+			process = psutil.Process(os.getpid())
+			pMemoryUsed = process.memory_info().rss/1000000 #This retrieves the physical memory allocated
+			vMemoryUsed = process.memory_info().vms/1000000 #This retrieves the virtual memory allocated
+			statistics.peakClosed = len(openList.exploredSet)
+			statistics.finish(pMemoryUsed)
+			
+		return (solution, runningTime, pMemoryUsed, vMemoryUsed, statistics)
+
+	def aStarPatternDatabase(puzzleBoardNode, goalNode, actions, patternDatabase, verbose = True):
+		'''
+			This method takes the complete initial state of the puzzle board (the root) as the argument. It uses the additive pattern database as the heuristics.
+			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state, some time/memory statistics
+			and the SearchStatistics of the run. 
+		'''
+		solution = []
+		statistics = SearchStatistics('patterndb', 'cost')
+		statistics.startTimers()
+		openList = OpenList() #priority queue with a hashed index of the frontier and a hashed explored set
+		openList.push(puzzleBoardNode, patternDatabase.distance(puzzleBoardNode.state)) #Enqueue operation
+		time1 = time.time() #start time
+		try:
+			while(len(openList) != 0):
+				clock1 = time.perf_counter()
+				node = openList.pop() #dequeues the node with the lowest total cost and adds it to the explored set
+				statistics.queueTime += time.perf_counter() - clock1
+				if(openList.lastCost != statistics.layerKey):
+					statistics.enterLayer(openList.lastCost)
+
+				#Goal test
+				if(node == goalNode):
+					if(verbose):
+						print('Goal Found')
+						node.print()
+					AStar.traceSolution(solution, node)
+					break
 
-				#Branching point
+				#Branching point - the children are generated, evaluated and queued in separate passes, so that each pass is timed as a whole
+				clock1 = time.perf_counter()
+				children = []
 				for action in actions:
-					tNode =  AStar.moveBlank('Manhattan', node, action, goalTilePos) #since its pass by reference, need to maintain the ref to original node
-					
-					#Check to remove repeated states
-					if((tNode not in exploredNodesSet) and (not AStar.isNodeInFrontier((tNode.moveCost + tNode.manhattanDistance, tNode), frontierList))):
-						#Goal test
-						if(tNode == goalNode):
-							print('Goal Found')
-							tNode.print()
-							AStar.traceSolution(solution, tNode)
-							flag = 1
-							break
-						else:
-							heappush(frontierList, (tNode.moveCost + tNode.manhattanDistance, tNode)) #add the new node generated to the frontier if its not a list
-
-				if(flag):
-					break #exit the while loop if a solution is found
+					tNode =  AStar.moveBlank(None, node, action) #since its pass by reference, need to maintain the ref to original node
+					if(tNode is not None): #None if the blank is on the edge of the board
+						children.append(tNode)
+				clock2 = time.perf_counter()
+				#skip the table lookups for explored states, the open list would drop them anyway
+				evaluated = []
+				for tNode in children:
+					if(tNode.state not in openList.exploredSet):
+						evaluated.append((tNode, patternDatabase.distance(tNode.state)))
+					else:
+						statistics.nodesDeduplicated += 1
+				clock3 = time.perf_counter()
+				for tNode, heuristic in evaluated:
+					if(not openList.push(tNode, heuristic)):
+						statistics.nodesDeduplicated += 1
+				clock4 = time.perf_counter()
+				statistics.moveTime += clock2 - clock1
+				statistics.heuristicTime += clock3 - clock2
+				statistics.queueTime += clock4 - clock3
+				statistics.nodesExpanded += 1
+				statistics.nodesGenerated += len(children)
+				if(len(openList) > statistics.peakFrontier):
+					statistics.peakFrontier = len(openList)
 
 		except MemoryError:
 			print('Failure - Ran out of memory!')
@@ -218,47 +291,209 @@ class AStar:
 			process = psutil.Process(os.getpid())
 			pMemoryUsed = process.memory_info().rss/1000000 #This retrieves the physical memory allocated
 			vMemoryUsed = process.memory_info().vms/1000000 #This retrieves the virtual memory allocated
+			statistics.peakClosed = len(openList.exploredSet)
+			statistics.finish(pMemoryUsed)
 			
-		return (solution, runningTime, pMemoryUsed, vMemoryUsed)
+		return (solution, runningTime, pMemoryUsed, vMemoryUsed, statistics)
 
-class XYPos:
-	'(x, y) coordinate representation class'
+	def makeMove(node, action):
+		'''
+		This method moves the blank of the given node in place, without creating a child, and updates its Manhattan distance and packed state.
+		It returns False and leaves the node unchanged if the move would take the blank off the board
+		'''
+		shape = node.shape
+		newBlankIndex = shape.neighborCell[node.blankIndex][action]
+		if(newBlankIndex == -1):
+			return False
+
+		#the tile next to the blank slides into the blank cell
+		tile = BoardEncoding.tileAt(node.state, newBlankIndex, shape.bits)
+		AStar.updateManhattanDistance(node, tile, newBlankIndex, node.blankIndex)
+		node.state = BoardEncoding.moveTile(node.state, tile, newBlankIndex, node.blankIndex, shape.bits)
+		node.blankIndex = newBlankIndex
+		node.moveCost += 1
+		return True
+
+	def unmakeMove(node, action):
+		'''
+		This method takes back a move done by makeMove on the same node
+		'''
+		AStar.makeMove(node, action ^ 1) #the reverse of an action is the action with the last bit flipped - Left/Right and Up/Down
+		node.moveCost -= 2
 
-	def __init__(self, x, y):
-		self.x = x
-		self.y = y
+	def idaSearch(node, goalNode, actions, path, threshold, lastAction, statistics):
+		'''
+		A recursive depth-first search bounded by the total cost threshold. The actions taken are pushed on to path.
+		The nodes generated and expanded are counted in statistics.
+		Returns -1 if the goal is reached, else the smallest total cost that exceeded the threshold (the next threshold)
+		'''
+		totalCost = node.moveCost + node.manhattanDistance
+		if(totalCost > threshold):
+			return totalCost
+
+		#Goal test
+		if(node == goalNode):
+			return -1
+
+		statistics.nodesExpanded += 1
+		if(len(path) >= statistics.peakFrontier):
+			statistics.peakFrontier = len(path) + 1
+		minCost = math.inf
+		for action in actions:
+			#moving the blank straight back only undoes the last move
+			if(action == (lastAction ^ 1)):
+				continue
+			if(not AStar.makeMove(node, action)):
+				continue
+			statistics.nodesGenerated += 1
+			path.append(action)
+			cost = AStar.idaSearch(node, goalNode, actions, path, threshold, action, statistics)
+			if(cost == -1):
+				return -1 #leave the board at the goal and the path intact
+			path.pop()
+			AStar.unmakeMove(node, action)
+			minCost = min(minCost, cost)
+		return minCost
+
+	def idaStarManhattan(puzzleBoardNode, goalNode, actions, verbose = True):
+		'''
+			This method takes the complete initial state of the puzzle board (the root) as the argument. It runs IDA* using the Manhattan Distance as the heuristics.
+			Only a single board is kept and moves are made/unmade on it in place, so the memory used grows with the depth of the solution only.
+			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state, some time/memory statistics
+			and the SearchStatistics of the run. 
+		'''
+		solution = []
+		statistics = SearchStatistics('idastar', 'threshold')
+		path = []
+		#working copy of the root that is moved around in place by the search
+		node = PuzzleBoardNode(puzzleBoardNode.state, puzzleBoardNode.shape, None, -1, puzzleBoardNode.blankIndex, 0, puzzleBoardNode.manhattanDistance)
+		threshold = node.manhattanDistance
+		time1 = time.time() #start time
+		try:
+			while(True):
+				statistics.enterLayer(threshold)
+				threshold = AStar.idaSearch(node, goalNode, actions, path, threshold, -1, statistics)
+				if(threshold == -1):
+					if(verbose):
+						print('Goal Found')
+						node.print()
+					solution = path[::-1] #same order as traceSolution - goal to root
+					break
+				if(threshold == math.inf):
+					break #every reachable state has been searched
+		except MemoryError:
+			print('Failure - Ran out of memory!')
+		else:
+			time2 = time.time()
+			runningTime = (time2 - time1) #calculates the elapsed time
+			process = psutil.Process(os.getpid())
+			pMemoryUsed = process.memory_info().rss/1000000 #This retrieves the physical memory allocated
+			vMemoryUsed = process.memory_info().vms/1000000 #This retrieves the virtual memory allocated
+			statistics.finish(pMemoryUsed)
+
+		return (solution, runningTime, pMemoryUsed, vMemoryUsed, statistics)
+
+class OpenList:
+	'This class is the priority queue used as the A* frontier. It indexes the queued states so that lookups are constant time'
+	'''
+	heap - binary heap of (totalCost, heuristic, insertion order, node) entries. Ties on total cost go to the node closer to the goal
+	bestCost - dictionary of packed state -> lowest move cost the state is queued with
+	exploredSet - set of the packed states that have already been dequeued and expanded
+	size - number of distinct states in the frontier, which is less than len(heap) when stale entries are waiting to be skipped
+	lastCost - total cost of the node dequeued last
+
+	A cheaper path to a queued state pushes a new heap entry and lowers bestCost (decrease-key by lazy deletion).
+	The old entry is discarded when it reaches the top of the heap. Explored states are never reopened, which is
+	safe because the Manhattan and displaced tiles heuristics are consistent.
+	'''
+
+	def __init__(self):
+		self.heap = []
+		self.bestCost = {}
+		self.exploredSet = set()
+		self.counter = 0
+		self.size = 0
+		self.lastCost = None
+
+	def __len__(self):
+		return self.size
+
+	def __contains__(self, node):
+		return node.state in self.bestCost
+
+	def push(self, node, heuristic):
+		'''
+		This method queues the node with priority moveCost + heuristic in O(log n).
+		Returns False without queueing if the state is explored or already queued with the same or a lower move cost
+		'''
+		if(node.state in self.exploredSet):
+			return False
+		best = self.bestCost.get(node.state)
+		if(best is not None and best <= node.moveCost):
+			return False
+		if(best is None):
+			self.size += 1
+		self.bestCost[node.state] = node.moveCost
+		heappush(self.heap, (node.moveCost + heuristic, heuristic, self.counter, node))
+		self.counter += 1
+		return True
+
+	def pop(self):
+		'''
+		This method dequeues the node with the lowest total cost, skipping stale entries, and marks its state explored.
+		Returns None when the frontier is empty
+		'''
+		while(len(self.heap) != 0):
+			totalCost, heuristic, counter, node = heappop(self.heap)
+			if(node.state in self.exploredSet or self.bestCost[node.state] != node.moveCost):
+				continue #stale entry of a state that was since queued with a lower move cost, or already expanded
+			self.lastCost = totalCost
+			del self.bestCost[node.state]
+			self.exploredSet.add(node.state)
+			self.size -= 1
+			return node
+		return None
 
 class PuzzleBoardNode:
 	'This class is used to represent a particular state of the puzzle board'
 	'''
-	puzzleBoard - a 4 x 4 Matrix
+	state - the board packed into an integer by BoardEncoding
+	shape - object of type BoardShape with the dimensions and move tables of the board. Shared by all the nodes of a search
 	parentNode - object of type PuzzleBoardNode. Used to traceback the path to root. For root, this is None.
 	actionTaken - The action taken to reach this node. -1 for root node
-	blankPosition - a data object to track where the blank cell is in the board
+	blankIndex - the cell (row * cols + col) where the blank is on the board
 	'''
 
-	def __init__(self, puzzleBoard, parent, action, blankPosition, moveCost = 0, manhattanDistance = 0, numDisplacedTiles = 0):
-		self.puzzleBoard = puzzleBoard
+	def __init__(self, state, shape, parent, action, blankIndex, moveCost = 0, manhattanDistance = 0, numDisplacedTiles = 0):
+		self.state = state
+		self.shape = shape
 		self.parentNode = parent
 		self.actionTaken = action
-		self.blankPosition = blankPosition
+		self.blankIndex = blankIndex
 		self.moveCost = moveCost
 		self.manhattanDistance = manhattanDistance
 		self.numDisplacedTiles = numDisplacedTiles
 
+	def fromBoard(puzzleBoard):
+		'''
+		This method creates a root node from a list-of-lists puzzle board with -1 as the blank
+		'''
+		cells = [cell for row in puzzleBoard for cell in row]
+		return PuzzleBoardNode(BoardEncoding.pack(puzzleBoard), BoardShape.get(len(puzzleBoard), len(puzzleBoard[0])), None, -1, cells.index(-1))
+
 	def __eq__(self, puzzleBoardNode):
 		#checks if two puzzle boards have the same configuration and can be used to check if a node is visited or not(just check if a node equals any in frontier or explored set)
-		return not((self.puzzleBoard > puzzleBoardNode.puzzleBoard) - (self.puzzleBoard < puzzleBoardNode.puzzleBoard)) #python3 workaround for cmp()
+		return self.state == puzzleBoardNode.state
 
-	def __hash__(self): #this has to be implemented since __eq__ has been overridden
-		return id(self)	
+	def __hash__(self): #hashes on the board configuration so that equal boards land in the same set/dict slot
+		return hash(self.state)
 
 	def __lt__(self, puzzleBoardNode):
 		#heappush requires overriding this for some reason.
 		return (self.manhattanDistance < puzzleBoardNode.manhattanDistance) or ((self.moveCost + self.numDisplacedTiles) < (puzzleBoardNode.moveCost + puzzleBoardNode.numDisplacedTiles))
 	
 	def print(self):
-		for row in self.puzzleBoard:
+		for row in BoardEncoding.unpack(self.state, self.shape.rows, self.shape.cols):
 			for cell in row:
 				print(cell, end = " ")
 			print("\n")
@@ -270,25 +505,35 @@ class FifteenPuzzle:
 	solution - array of integers denoting the actions left, right, up and down.
 	goalNode - the representation of the goal node
 	actions - the possible list of actions
+	patternDatabase - object of type PatternDatabase, or None to skip the pattern database search
 	'''
 
-	def __init__(self, puzzleBoardRoot, goalNode, goalTilePos, actions):
+	def __init__(self, puzzleBoardRoot, goalNode, actions, patternDatabase = None):
 		self.puzzleBoardRoot = puzzleBoardRoot
 		self.goalNode = goalNode
 		self.actions = actions
-		self.goalTilePos = goalTilePos
+		self.patternDatabase = patternDatabase
 
 	def forwardSearch(self):
 		'''
-			This method calls the A8 method that uses the manhattan and displaced tiles heuristics and passes the current state of the puzzle board.
+			This method calls the A* and IDA* methods that use the manhattan and displaced tiles heuristics and passes the current state of the puzzle board.
 		'''
-		AStar.calculateManhattanDistance(self.puzzleBoardRoot, self.goalTilePos)
-		self.solution = AStar.aStarManhattan(self.puzzleBoardRoot, self.goalNode, self.goalTilePos, self.actions)
+		AStar.calculateManhattanDistance(self.puzzleBoardRoot)
+		self.solution = AStar.aStarManhattan(self.puzzleBoardRoot, self.goalNode, self.actions)
 		print('A* Algorithm using Manhattan Distance as the heuristic function - ')
 		self.printSolution()
 
+		self.solution = AStar.idaStarManhattan(self.puzzleBoardRoot, self.goalNode, self.actions)
+		print('IDA* Algorithm using Manhattan Distance as the heuristic function - ')
+		self.printSolution()
+
+		if(self.patternDatabase is not None):
+			self.solution = AStar.aStarPatternDatabase(self.puzzleBoardRoot, self.goalNode, self.actions, self.patternDatabase)
+			print('A* Algorithm using the additive Pattern Database as the heuristic function - ')
+			self.printSolution()
+
 		self.puzzleBoardRoot.manhattanDistance = 0
-		self.solution = AStar.aStarDisplTiles(self.puzzleBoardRoot, self.goalNode, self.goalTilePos, self.actions)
+		self.solution = AStar.aStarDisplTiles(self.puzzleBoardRoot, self.goalNode, self.actions)
 		print('A* Algorithm using Displaced Tiles as the heuristic function - ')
 		self.printSolution()
 
@@ -317,51 +562,46 @@ class FifteenPuzzle:
 		print('Elapsed Time - ', self.solution[1], 'seconds')
 		print('Physical Memory Used - ', self.solution[2], 'MB')
 		print('Virtual Memory Used - ', self.solution[3], 'MB')
+		self.solution[4].print()
 
 if (__name__ == '__main__'):
-	print("Enter the 15-puzzle input as a space seperated values. For the blank, input either b or B. This char will be converted to -1 for solving")
+	print("Enter the puzzle input as a space seperated values, row by row. For the blank, input either b or B. This char will be converted to -1 for solving")
 	'''
 	User must provide input in the format - 1 2 3 4 5 6 7 8 9 10 B 11 12 13 14 15
+	Square boards of any size (8-puzzle, 15-puzzle, 24-puzzle ...) are recognized from the number of values.
+	For other boards give the dimensions as an argument, for example - python PuzzleSolver_AStar.py 3x4
 	'''
 	
-	initialState = []
-	temp = []
+	dimensions = (None, None)
+	for argument in sys.argv[1:]:
+		if(BoardInput.parseDimensions(argument) is not None):
+			dimensions = BoardInput.parseDimensions(argument)
 
 	while(True):
-		rawInput = input('Enter input here : ').split(' ')
-
-		if(len(rawInput) != 16):
-			print('Insufficient elements for a 15-Puzzle. Re-enter input!')
+		try:
+			initialState = BoardInput.parse(input('Enter input here : '), dimensions[0], dimensions[1])
+		except ValueError as error:
+			print(str(error) + '. Re-enter input!')
 			continue
 
-		rawInputIndex = 0
-		counter = 1
-		goalTilePos = {} #Caching the goal position of each tile for constant time lookups
-		for i in range(4):
-			temp = []
-			for j in range(4):
-				goalTilePos[counter] = (i, j)
-				counter += 1
-
-				if(rawInput[rawInputIndex] == 'b' or rawInput[rawInputIndex] == 'B'):
-					temp.append(-1)
-					xy = XYPos(i, j)
-				else:
-					temp.append(int(rawInput[rawInputIndex]))
-				rawInputIndex += 1
-			initialState.append(temp)
-		
-		goalState = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, -1]]
+		shape = BoardShape.get(len(initialState), len(initialState[0]))
 		actions = [2, 3, 0, 1]
 
-		root = PuzzleBoardNode(initialState, None, -1, xy)
-		goal = PuzzleBoardNode(goalState, None, -1, XYPos(3, 3))
+		root = PuzzleBoardNode.fromBoard(initialState)
+		goal = PuzzleBoardNode.fromBoard(shape.goalBoard)
 
 		print('Initial State')
 		root.print()
 		print('Goal State')
 		goal.print()
 
-		puzzleSolver = FifteenPuzzle(root, goal, goalTilePos, actions)
+		#the pattern database is only used for the 15-puzzle and if its tables have been built - see PuzzleSolver_PatternDB.py
+		patternDatabase = None
+		for partition in (('663', '555') if shape.rows == 4 and shape.cols == 4 else ()):
+			patternDatabase = PatternDatabase.load(PatternDatabase.defaultDirectory(), 4, 4, PatternDatabase.PARTITIONS[partition])
+			if(patternDatabase is not None):
+				break
+
+		puzzleSolver = FifteenPuzzle(root, goal, actions, patternDatabase)
 		puzzleSolver.forwardSearch()
 		break
\ No newline at end of file
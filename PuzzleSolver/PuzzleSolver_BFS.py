@@ -9,8 +9,11 @@ Readme:
 #!/usr/bin/python3
 import time
 import os
+import sys
 import psutil
-import copy
+
+from PuzzleSolver_Board import BoardEncoding, BoardInput, BoardShape
+from PuzzleSolver_Stats import SearchStatistics
 
 #All variables are passed by reference in Python
 class BFS:
@@ -18,42 +21,21 @@ class BFS:
 	
 	def moveBlank(node, action):
 		'''
-		This function swaps the blank cell and the nearby cell based on the action given in input argument
-		It returns a new child node with the new configuration
-		'''
-		#to retain the original reference to a node, this temporary node is created
-		tNode = PuzzleBoardNode(copy.deepcopy(node.puzzleBoard), node, action, XYPos(node.blankPosition.x, node.blankPosition.y))
-		if(action == 0):
-			#Left
-			if(tNode.blankPosition.y > 0):				
-				tNode.blankPosition.y -= 1
-		elif(action == 1):
-			#Right
-			if(tNode.blankPosition.y < (len(tNode.puzzleBoard[0]) - 1)):
-				tNode.blankPosition.y += 1
-		elif(action == 2):
-			#Up
-			if(tNode.blankPosition.x > 0):
-				tNode.blankPosition.x -= 1
-		elif(action == 3):
-			#Down
-			if(tNode.blankPosition.x < (len(tNode.puzzleBoard) - 1)):
-				tNode.blankPosition.x += 1
-
-		#swap the nearby value cell and the blank cell
-		tNode.puzzleBoard[node.blankPosition.x][node.blankPosition.y] = tNode.puzzleBoard[tNode.blankPosition.x][tNode.blankPosition.y]
-		tNode.puzzleBoard[tNode.blankPosition.x][tNode.blankPosition.y] = -1
-
-		return tNode
-
-	def isNodeInFrontier(tNode, frontierList):
-		'''
-		This method iterates through the frontier list to find if the given node is present or not
-		'''
-		for node in frontierList:
-			if(tNode == node):
-				return 1
-		return 0
+		This function slides the tile next to the blank, in the direction given by the action, into the blank cell
+		It returns a new child node with the new configuration, or None if the action would take the blank off the board
+		'''
+		#the board of the parent is never copied, the child gets a new packed state with the one tile moved
+		newBlankIndex = node.shape.neighborCell[node.blankIndex][action]
+		if(newBlankIndex == -1):
+			return None
+		tile = BoardEncoding.tileAt(node.state, newBlankIndex, node.shape.bits)
+		return PuzzleBoardNode(BoardEncoding.moveTile(node.state, tile, newBlankIndex, node.blankIndex, node.shape.bits), node.shape, node, action, newBlankIndex)
+
+	def isNodeInFrontier(tNode, frontierStates):
+		'''
+		This method looks up the packed state of the given node in the hashed set of frontier states
+		'''
+		return tNode.state in frontierStates
 
 	def traceSolution(solution, tNode):
 		'''
@@ -64,45 +46,79 @@ class BFS:
 			solution.append(tNode.actionTaken)
 			BFS.traceSolution(solution, tNode.parentNode)
 
-	def bfs(puzzleBoardNode, goalNode, actions):
+	def bfs(puzzleBoardNode, goalNode, actions, verbose = True):
 		'''
 			The bfs method takes the complete initial state of the puzzle board (the root) as the argument.
-			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state and some time/memory statistics. 
+			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state, some time/memory statistics
+			and the SearchStatistics of the run. 
 		'''
 		solution = []
-		exploredNodesSet = set() #unordered set
+		statistics = SearchStatistics('bfs', 'depth')
+		statistics.startTimers()
+		exploredNodesSet = set() #unordered set of the packed states explored so far
 		frontierList = [] #this has to be ordered to implement a FIFO Queue - pop(0) to dequeue
+		frontierStates = set() #packed states currently in the frontier, for constant time membership checks
 		frontierList.append(puzzleBoardNode);
+		frontierStates.add(puzzleBoardNode.state)
+		layerRemaining = 1 #nodes of the current depth still in the frontier, the rest of the frontier is one deeper
+		depth = 0
+		statistics.enterLayer(depth)
 		time1 = time.time() #start time
 		try:
 			while(len(frontierList) != 0):
+				if(layerRemaining == 0):
+					depth += 1
+					statistics.enterLayer(depth)
+					layerRemaining = len(frontierList)
+				layerRemaining -= 1
+
+				clock1 = time.perf_counter()
 				node = frontierList.pop(0) #this is the dequeue operation on the FIFO queue
-				exploredNodesSet.add(node) #node to be explored now is added to the explored set
+				frontierStates.discard(node.state)
+				exploredNodesSet.add(node.state) #node to be explored now is added to the explored set
+				statistics.queueTime += time.perf_counter() - clock1
 
 				#Goal test
 				if(node == goalNode):
-					print('Goal Found')
-					node.print()
+					if(verbose):
+						print('Goal Found')
+						node.print()
 					BFS.traceSolution(solution, node)
 					break
 
 				flag = 0
 
-				#Branching point
+				#Branching point - the children are generated first and then checked and queued, so that each pass is timed as a whole
+				clock1 = time.perf_counter()
+				children = []
 				for action in actions:
 					tNode =  BFS.moveBlank(node, action) #since its pass by reference, need to maintain the ref to original node
-					
+					if(tNode is not None): #None if the blank is on the edge of the board
+						children.append(tNode)
+				clock2 = time.perf_counter()
+				statistics.moveTime += clock2 - clock1
+				statistics.nodesExpanded += 1
+				statistics.nodesGenerated += len(children)
+
+				for tNode in children:
 					#Check to remove repeated states
-					if((tNode not in exploredNodesSet) and (BFS.isNodeInFrontier(tNode, frontierList) == 0)):
+					if((tNode.state not in exploredNodesSet) and (not BFS.isNodeInFrontier(tNode, frontierStates))):
 						#Goal test
 						if(tNode == goalNode):
-							print('Goal Found')
-							tNode.print()
+							if(verbose):
+								print('Goal Found')
+								tNode.print()
 							BFS.traceSolution(solution, tNode)
 							flag = 1
 							break
 						else:
 							frontierList.append(tNode) #add the new node generated to the frontier if its not a list
+							frontierStates.add(tNode.state)
+					else:
+						statistics.nodesDeduplicated += 1
+				statistics.queueTime += time.perf_counter() - clock2
+				if(len(frontierList) > statistics.peakFrontier):
+					statistics.peakFrontier = len(frontierList)
 				if(flag):
 					break #exit the while loop if a solution is found
 
@@ -114,40 +130,142 @@ class BFS:
 			process = psutil.Process(os.getpid())
 			pMemoryUsed = process.memory_info().rss/1000000 #This retrieves the physical memory allocated
 			vMemoryUsed = process.memory_info().vms/1000000 #This retrieves the virtual memory allocated
+			statistics.peakClosed = len(exploredNodesSet)
+			statistics.finish(pMemoryUsed)
 			
-		return (solution, runningTime, pMemoryUsed, vMemoryUsed)
+		return (solution, runningTime, pMemoryUsed, vMemoryUsed, statistics)
+
+	def nodeDepth(tNode):
+		'''
+		This method returns the number of moves from the root (or goal) of the search tree to the given node
+		'''
+		depth = 0
+		while(tNode.parentNode):
+			depth += 1
+			tNode = tNode.parentNode
+		return depth
+
+	def bidirectionalBfs(puzzleBoardNode, goalNode, actions, verbose = True):
+		'''
+			The bidirectionalBfs method takes the complete initial state of the puzzle board (the root) as the argument.
+			It runs two breadth-first searches, one from the root and one from the goal, expanding a full depth layer of each side alternately
+			until the two meet. Each side only has to go about half the solution depth, so far fewer nodes are generated than by bfs.
+			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state, some time/memory statistics
+			and the SearchStatistics of the run. 
+		'''
+		solution = []
+		statistics = SearchStatistics('bidirectional', 'depth')
+		statistics.startTimers()
+		#packed state -> node, for the states reached from the root and from the goal. The nodes are kept to trace the two halves of the path
+		visitedMaps = [{puzzleBoardNode.state : puzzleBoardNode}, {goalNode.state : goalNode}]
+		frontierLayers = [[puzzleBoardNode], [goalNode]]
+		side = 0 #0 -> expand from the root, 1 -> expand from the goal
+		depth = 0 #sum of the depths reached from the root and from the goal
+		time1 = time.time() #start time
+		try:
+			if(puzzleBoardNode == goalNode):
+				if(verbose):
+					print('Goal Found')
+					puzzleBoardNode.print()
+			else:
+				meeting = None
+				while(len(frontierLayers[0]) != 0 and len(frontierLayers[1]) != 0):
+					depth += 1
+					statistics.enterLayer(depth)
+					visited = visitedMaps[side]
+					otherVisited = visitedMaps[1 - side]
+					nextLayer = []
+
+					#Branching point - the whole layer is expanded so that the shortest of the meetings found in it is used
+					for node in frontierLayers[side]:
+						clock1 = time.perf_counter()
+						children = []
+						for action in actions:
+							tNode = BFS.moveBlank(node, action)
+							if(tNode is not None):
+								children.append(tNode)
+						clock2 = time.perf_counter()
+						statistics.moveTime += clock2 - clock1
+						statistics.nodesExpanded += 1
+						statistics.nodesGenerated += len(children)
+
+						for tNode in children:
+							if(tNode.state in visited):
+								statistics.nodesDeduplicated += 1
+								continue
+							visited[tNode.state] = tNode
+							nextLayer.append(tNode)
+
+							#the two searches meet
+							otherNode = otherVisited.get(tNode.state)
+							if(otherNode is not None):
+								otherDepth = BFS.nodeDepth(otherNode)
+								if(meeting is None or otherDepth < meeting[2]):
+									meeting = (tNode, otherNode, otherDepth) if side == 0 else (otherNode, tNode, otherDepth)
+						statistics.queueTime += time.perf_counter() - clock2
 
-class XYPos:
-	'(x, y) coordinate representation class'
+					statistics.peakFrontier = max(statistics.peakFrontier, len(nextLayer) + len(frontierLayers[1 - side]))
+					statistics.peakClosed = len(visited) + len(otherVisited)
+					if(meeting is not None):
+						forwardNode, backwardNode = meeting[0], meeting[1]
+						if(verbose):
+							print('Goal Found')
+							goalNode.print()
+						#the moves from the goal side are undone in reverse order to go from the meeting state to the goal
+						backwardActions = []
+						BFS.traceSolution(backwardActions, backwardNode)
+						solution = [action ^ 1 for action in reversed(backwardActions)] #reverse of an action flips the last bit - Left/Right and Up/Down
+						BFS.traceSolution(solution, forwardNode)
+						break
+
+					frontierLayers[side] = nextLayer
+					side = 1 - side
 
-	def __init__(self, x, y):
-		self.x = x
-		self.y = y
+		except MemoryError:
+			print('Failure - Ran out of memory!')
+		else:
+			time2 = time.time()
+			runningTime = (time2 - time1) #calculates the elapsed time
+			process = psutil.Process(os.getpid())
+			pMemoryUsed = process.memory_info().rss/1000000 #This retrieves the physical memory allocated
+			vMemoryUsed = process.memory_info().vms/1000000 #This retrieves the virtual memory allocated
+			statistics.finish(pMemoryUsed)
+			
+		return (solution, runningTime, pMemoryUsed, vMemoryUsed, statistics)
 
 class PuzzleBoardNode:
 	'This class is used to represent a particular state of the puzzle board'
 	'''
-	puzzleBoard - a 4 x 4 Matrix
+	state - the board packed into an integer by BoardEncoding
+	shape - object of type BoardShape with the dimensions and move tables of the board. Shared by all the nodes of a search
 	parentNode - object of type PuzzleBoardNode. Used to traceback the path to root. For root, this is None.
 	actionTaken - The action taken to reach this node. -1 for root node
-	blankPosition - a data object to track where the blank cell is in the board
+	blankIndex - the cell (row * cols + col) where the blank is on the board
 	'''
 
-	def __init__(self, puzzleBoard, parent, action, blankPosition):
-		self.puzzleBoard = puzzleBoard
+	def __init__(self, state, shape, parent, action, blankIndex):
+		self.state = state
+		self.shape = shape
 		self.parentNode = parent
 		self.actionTaken = action
-		self.blankPosition = blankPosition
+		self.blankIndex = blankIndex
+
+	def fromBoard(puzzleBoard):
+		'''
+		This method creates a root node from a list-of-lists puzzle board with -1 as the blank
+		'''
+		cells = [cell for row in puzzleBoard for cell in row]
+		return PuzzleBoardNode(BoardEncoding.pack(puzzleBoard), BoardShape.get(len(puzzleBoard), len(puzzleBoard[0])), None, -1, cells.index(-1))
 
 	def __eq__(self, puzzleBoardNode):
 		#checks if two puzzle boards have the same configuration and can be used to check if a node is visited or not(just check if a node equals any in frontier or explored set)
-		return not((self.puzzleBoard > puzzleBoardNode.puzzleBoard) - (self.puzzleBoard < puzzleBoardNode.puzzleBoard)) #python3 workaround for cmp()
+		return self.state == puzzleBoardNode.state
 
-	def __hash__(self): #this has to be implemented since __eq__ has been overridden
-		return id(self)	
+	def __hash__(self): #hashes on the board configuration so that equal boards land in the same set/dict slot
+		return hash(self.state)
 	
 	def print(self):
-		for row in self.puzzleBoard:
+		for row in BoardEncoding.unpack(self.state, self.shape.rows, self.shape.cols):
 			for cell in row:
 				print(cell, end = " ")
 			print("\n")
@@ -173,6 +291,13 @@ class FifteenPuzzle:
 		self.solution = BFS.bfs(self.puzzleBoardRoot, self.goalNode, self.actions)
 		self.printSolution()
 
+	def bidirectionalSearch(self):
+		'''
+			This method calls the bidirectionalBfs method and passes the current state of the puzzle board.
+		'''
+		self.solution = BFS.bidirectionalBfs(self.puzzleBoardRoot, self.goalNode, self.actions)
+		self.printSolution()
+
 	def printSolution(self):
 		'''
 			In the array, 0 -> move blank left, 1 -> move blank right, 2 -> move blank up, 3 -> move blank down.
@@ -198,40 +323,34 @@ class FifteenPuzzle:
 		print('Elapsed Time - ', self.solution[1], 'seconds')
 		print('Physical Memory Used - ', self.solution[2], 'MB')
 		print('Virtual Memory Used - ', self.solution[3], 'MB')
+		self.solution[4].print()
 
 if (__name__ == '__main__'):
-	print("Enter the 15-puzzle input as a space seperated values. For the blank, input either b or B. This char will be converted to -1 for solving")
+	print("Enter the puzzle input as a space seperated values, row by row. For the blank, input either b or B. This char will be converted to -1 for solving")
 	'''
 	User must provide input in the format - 1 2 3 4 5 6 7 8 9 10 B 11 12 13 14 15
+	Square boards of any size (8-puzzle, 15-puzzle, 24-puzzle ...) are recognized from the number of values.
+	For other boards give the dimensions as an argument, for example - python PuzzleSolver_BFS.py 3x4
+	Run as - python PuzzleSolver_BFS.py bidirectional - to search from both the root and the goal
 	'''
 	
-	initialState = []
-	temp = []
+	dimensions = (None, None)
+	for argument in sys.argv[1:]:
+		if(BoardInput.parseDimensions(argument) is not None):
+			dimensions = BoardInput.parseDimensions(argument)
 
 	while(True):
-		rawInput = input('Enter input here : ').split(' ')
-
-		if(len(rawInput) != 16):
-			print('Insufficient elements for a 15-Puzzle. Re-enter input!')
+		try:
+			initialState = BoardInput.parse(input('Enter input here : '), dimensions[0], dimensions[1])
+		except ValueError as error:
+			print(str(error) + '. Re-enter input!')
 			continue
 
-		rawInputIndex = 0
-		for i in range(4):
-			temp = []
-			for j in range(4):
-				if(rawInput[rawInputIndex] == 'b' or rawInput[rawInputIndex] == 'B'):
-					temp.append(-1)
-					xy = XYPos(i, j)
-				else:
-					temp.append(int(rawInput[rawInputIndex]))
-				rawInputIndex += 1
-			initialState.append(temp)
-		
-		goalState = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, -1]]
+		shape = BoardShape.get(len(initialState), len(initialState[0]))
 		actions = [2, 3, 0, 1]
 
-		root = PuzzleBoardNode(initialState, None, -1, xy)
-		goal = PuzzleBoardNode(goalState, None, -1, XYPos(3, 3))
+		root = PuzzleBoardNode.fromBoard(initialState)
+		goal = PuzzleBoardNode.fromBoard(shape.goalBoard)
 
 		print('Initial State')
 		root.print()
@@ -239,5 +358,8 @@ if (__name__ == '__main__'):
 		goal.print()
 
 		puzzleSolver = FifteenPuzzle(root, goal, actions)
-		puzzleSolver.forwardSearch()
+		if('bidirectional' in sys.argv[1:]):
+			puzzleSolver.bidirectionalSearch()
+		else:
+			puzzleSolver.forwardSearch()
 		break
\ No newline at end of file
@@ -0,0 +1,326 @@
+"""
+Readme:
+- This Python script solves many puzzle boards in one run, with any of the BFS, IDS and AStar search engines.
+- The boards are read one per line (in the same format as the other scripts) from a file or stdin, and one result record per board
+  is written as a line of JSON (newline-delimited JSON).
+- The board tables, pattern database and solver modules are set up once and shared by all the boards of the run.
+- With --workers, --timeout or --memory-limit the boards are solved on a pool of worker processes, one per core by default.
+- Usage - python PuzzleSolver_Batch.py [--engine idastar] [--dimensions 3x3] [--output results.ndjson] [--workers N] [--timeout S] [--memory-limit MB] [boards.txt]
+"""
+
+#!/usr/bin/python3
+import argparse
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+
+import psutil
+
+import PuzzleSolver_AStar
+import PuzzleSolver_BFS
+import PuzzleSolver_IDS
+from PuzzleSolver_Board import BoardInput, BoardShape
+from PuzzleSolver_PatternDB import PatternDatabase
+
+class BatchSolver:
+	'This class solves a stream of puzzle boards with one search engine and returns a result record for each of them'
+	'''
+	engine - name of the search engine, one of BatchSolver.ENGINES
+	rows, cols - dimensions of the boards, or None to take square boards from the number of values on a line
+	patternDatabase - object of type PatternDatabase, used by the patterndb engine
+	goalNodes - (rows, cols) -> goal node, built once per board size
+	'''
+
+	#engine name -> (solver module, search method, True if the root needs its Manhattan distance)
+	ENGINES = {
+		'bfs' : (PuzzleSolver_BFS, PuzzleSolver_BFS.BFS.bfs, False),
+		'bidirectional' : (PuzzleSolver_BFS, PuzzleSolver_BFS.BFS.bidirectionalBfs, False),
+		'ids' : (PuzzleSolver_IDS, PuzzleSolver_IDS.IDS.ids, False),
+		'astar' : (PuzzleSolver_AStar, PuzzleSolver_AStar.AStar.aStarManhattan, True),
+		'idastar' : (PuzzleSolver_AStar, PuzzleSolver_AStar.AStar.idaStarManhattan, True),
+		'displacedtiles' : (PuzzleSolver_AStar, PuzzleSolver_AStar.AStar.aStarDisplTiles, False),
+		'patterndb' : (PuzzleSolver_AStar, PuzzleSolver_AStar.AStar.aStarPatternDatabase, False),
+	}
+
+	#action -> the direction the blank moves in
+	ACTION_NAMES = ('Left', 'Right', 'Up', 'Down')
+
+	def __init__(self, engine = 'idastar', rows = None, cols = None, patternDatabase = None):
+		if(engine not in BatchSolver.ENGINES):
+			raise ValueError('Unknown engine ' + engine + ' - choose one of ' + ', '.join(BatchSolver.ENGINES))
+		if(engine == 'patterndb' and patternDatabase is None):
+			for partition in ('663', '555'):
+				patternDatabase = PatternDatabase.load(PatternDatabase.defaultDirectory(), 4, 4, PatternDatabase.PARTITIONS[partition])
+				if(patternDatabase is not None):
+					break
+			if(patternDatabase is None):
+				raise ValueError('The pattern database tables have not been built - see PuzzleSolver_PatternDB.py')
+
+		self.engine = engine
+		self.rows = rows
+		self.cols = cols
+		self.patternDatabase = patternDatabase
+		self.goalNodes = {}
+		self.actions = [2, 3, 0, 1] #Up, Down, Left, Right
+
+	def solve(self, text, line = None):
+		'''
+		This method solves the board given as a line of input and returns its result record, a dictionary with
+		line - the line number of the board in the input, if given
+		input - the board as given
+		solved - True if a solution was found
+		length, moves - the number of moves and the directions the blank moves in, from the initial state to the goal
+		time - the running time of the search in seconds
+		memory - the physical memory used by the process after the search, in MB
+		statistics - the SearchStatistics of the search as a dictionary
+		error - why the board could not be solved, instead of the fields above
+		'''
+		record = {'line' : line} if line is not None else {}
+		record['input'] = text.strip()
+		record['engine'] = self.engine
+		try:
+			puzzleBoard = BoardInput.parse(text, self.rows, self.cols)
+		except ValueError as error:
+			record['error'] = str(error)
+			return record
+
+		module, search, needsManhattan = BatchSolver.ENGINES[self.engine]
+		shape = BoardShape.get(len(puzzleBoard), len(puzzleBoard[0]))
+		if(self.engine == 'patterndb' and (shape.rows, shape.cols) != (self.patternDatabase.rows, self.patternDatabase.cols)):
+			record['error'] = 'The pattern database is for ' + str(self.patternDatabase.rows) + 'x' + str(self.patternDatabase.cols) + ' boards only'
+			return record
+
+		goalNode = self.goalNodes.get((shape.rows, shape.cols))
+		if(goalNode is None):
+			goalNode = module.PuzzleBoardNode.fromBoard(shape.goalBoard)
+			self.goalNodes[(shape.rows, shape.cols)] = goalNode
+		root = module.PuzzleBoardNode.fromBoard(puzzleBoard)
+		if(needsManhattan):
+			PuzzleSolver_AStar.AStar.calculateManhattanDistance(root)
+
+		if(self.engine == 'patterndb'):
+			result = search(root, goalNode, self.actions, self.patternDatabase, verbose = False)
+		else:
+			result = search(root, goalNode, self.actions, verbose = False)
+
+		solution = result[0][::-1] #the engines return the actions from the goal back to the root
+		record['solved'] = len(solution) != 0 or root == goalNode
+		record['length'] = len(solution)
+		record['moves'] = [BatchSolver.ACTION_NAMES[action] for action in solution]
+		record['time'] = result[1]
+		record['memory'] = result[2]
+		record['statistics'] = result[4].toDict()
+		return record
+
+	def solveAll(self, lines):
+		'''
+		This method solves the boards of an iterable of lines (an open file, stdin or a list) one at a time and yields their result records.
+		Empty lines and lines starting with # are skipped
+		'''
+		for lineNumber, text in enumerate(lines, 1):
+			if(text.strip() == '' or text.lstrip().startswith('#')):
+				continue
+			yield self.solve(text, lineNumber)
+
+	def writeRecords(records, output):
+		'''
+		This method writes result records to an open file as newline-delimited JSON
+		'''
+		for record in records:
+			output.write(json.dumps(record) + '\n')
+
+class BatchPool:
+	'This class fans the boards of a batch out to a pool of worker processes, each with its own BatchSolver, and collects their result records'
+	'''
+	engine, rows, cols - the search engine and board dimensions of the BatchSolver in every worker
+	numWorkers - number of worker processes, one per core by default
+	timeout - seconds a board may be searched for before its worker is stopped and replaced, None for no limit
+	memoryLimit - MB of physical memory a worker may use before it is stopped and replaced, None for no limit
+	ordered - True to yield the records in input order, False to yield them as they complete
+
+	Every worker loads the board tables and the pattern database once and then solves one board after the other.
+	The pattern database tables are memory-mapped read-only, so the workers share the pages of the same files instead of each holding a copy.
+	'''
+
+	POLL_INTERVAL = 0.05 #seconds between checks of the time and memory limits of the busy workers
+
+	def __init__(self, engine = 'idastar', rows = None, cols = None, numWorkers = None, timeout = None, memoryLimit = None, ordered = True):
+		if(engine not in BatchSolver.ENGINES):
+			raise ValueError('Unknown engine ' + engine + ' - choose one of ' + ', '.join(BatchSolver.ENGINES))
+		self.engine = engine
+		self.rows = rows
+		self.cols = cols
+		self.numWorkers = numWorkers if numWorkers else os.cpu_count() or 1
+		self.timeout = timeout
+		self.memoryLimit = memoryLimit
+		self.ordered = ordered
+
+	def workerLoop(connection, engine, rows, cols):
+		'''
+		This method runs in a worker process. It solves the boards received over the connection until it receives None
+		'''
+		try:
+			batchSolver = BatchSolver(engine, rows, cols)
+		except ValueError as error:
+			batchSolver = None
+			setupError = str(error)
+		while(True):
+			job = connection.recv()
+			if(job is None):
+				break
+			index, line, text = job
+			if(batchSolver is None):
+				record = {'line' : line, 'input' : text.strip(), 'engine' : engine, 'error' : setupError}
+			else:
+				try:
+					record = batchSolver.solve(text, line)
+				except Exception as error:
+					record = {'line' : line, 'input' : text.strip(), 'engine' : engine, 'error' : repr(error)}
+			connection.send((index, record))
+		connection.close()
+
+	def startWorker(self):
+		'''
+		This method starts a worker process and returns (process, connection to it)
+		'''
+		parentConnection, childConnection = multiprocessing.Pipe()
+		process = multiprocessing.Process(target = BatchPool.workerLoop, args = (childConnection, self.engine, self.rows, self.cols), daemon = True)
+		process.start()
+		childConnection.close()
+		return (process, parentConnection)
+
+	def stopWorker(worker):
+		'''
+		This method kills a worker process, for one that went over its time or memory limit
+		'''
+		process, connection = worker
+		process.kill()
+		process.join()
+		connection.close()
+
+	def limitExceeded(self, worker, startTime):
+		'''
+		This method returns why a busy worker has to be stopped, or None if it is within its time and memory limits
+		'''
+		if(self.timeout is not None and time.time() - startTime > self.timeout):
+			return 'Timed out after ' + str(self.timeout) + ' seconds'
+		if(self.memoryLimit is not None):
+			try:
+				if(psutil.Process(worker[0].pid).memory_info().rss/1000000 > self.memoryLimit):
+					return 'Ran out of memory - over the limit of ' + str(self.memoryLimit) + ' MB'
+			except psutil.NoSuchProcess:
+				pass
+		return None
+
+	def errorRecord(self, job, error):
+		'''
+		This method returns the result record of a board that has no result from its worker
+		'''
+		index, line, text = job
+		return (index, {'line' : line, 'input' : text.strip(), 'engine' : self.engine, 'error' : error})
+
+	def solveAll(self, lines):
+		'''
+		This method solves the boards of an iterable of lines on the worker processes and yields their result records.
+		Empty lines and lines starting with # are skipped, as in BatchSolver.solveAll
+		'''
+		numberedLines = ((line, text) for line, text in enumerate(lines, 1) if text.strip() != '' and not text.lstrip().startswith('#'))
+		jobs = ((index, line, text) for index, (line, text) in enumerate(numberedLines))
+		idleWorkers = [self.startWorker() for i in range(self.numWorkers)]
+		busyWorkers = {} #connection -> (worker, job, start time)
+		finished = {} #index -> record, for the records waiting for an earlier one when ordered
+		nextIndex = 0
+		moreJobs = True
+		try:
+			while(True):
+				#hand out the next boards to the idle workers
+				while(moreJobs and len(idleWorkers) != 0):
+					job = next(jobs, None)
+					if(job is None):
+						moreJobs = False
+						break
+					worker = idleWorkers.pop()
+					worker[1].send(job)
+					busyWorkers[worker[1]] = (worker, job, time.time())
+				if(len(busyWorkers) == 0):
+					break
+
+				completed = []
+				for connection in multiprocessing.connection.wait(list(busyWorkers), BatchPool.POLL_INTERVAL):
+					worker, job, startTime = busyWorkers.pop(connection)
+					try:
+						completed.append(connection.recv())
+						idleWorkers.append(worker)
+					except (EOFError, OSError):
+						#the worker died without sending a record, for example killed by the operating system
+						BatchPool.stopWorker(worker)
+						idleWorkers.append(self.startWorker())
+						completed.append(self.errorRecord(job, 'Worker process died'))
+
+				for connection, (worker, job, startTime) in list(busyWorkers.items()):
+					reason = self.limitExceeded(worker, startTime)
+					if(reason is not None):
+						del busyWorkers[connection]
+						BatchPool.stopWorker(worker)
+						idleWorkers.append(self.startWorker())
+						completed.append(self.errorRecord(job, reason))
+
+				for index, record in completed:
+					if(self.ordered):
+						finished[index] = record
+					else:
+						yield record
+				while(nextIndex in finished):
+					yield finished.pop(nextIndex)
+					nextIndex += 1
+		finally:
+			for worker in idleWorkers:
+				try:
+					worker[1].send(None)
+				except OSError:
+					pass
+				worker[1].close()
+			for worker, job, startTime in busyWorkers.values():
+				BatchPool.stopWorker(worker)
+			for worker in idleWorkers:
+				worker[0].join()
+
+if (__name__ == '__main__'):
+	parser = argparse.ArgumentParser(description = 'Solve puzzle boards, one per line, and write one JSON result record per board')
+	parser.add_argument('input', nargs = '?', default = '-', help = 'file with one board per line, - for stdin (default)')
+	parser.add_argument('-e', '--engine', default = 'idastar', choices = sorted(BatchSolver.ENGINES), help = 'search engine (default idastar)')
+	parser.add_argument('-d', '--dimensions', help = 'board dimensions as rowsxcols, for boards that are not square')
+	parser.add_argument('-o', '--output', default = '-', help = 'file to write the records to, - for stdout (default)')
+	parser.add_argument('-w', '--workers', type = int, help = 'solve on this many worker processes, 0 for one per core')
+	parser.add_argument('-t', '--timeout', type = float, help = 'seconds a board may be searched for (runs on worker processes)')
+	parser.add_argument('-m', '--memory-limit', type = float, help = 'MB of memory a worker may use (runs on worker processes)')
+	parser.add_argument('-u', '--unordered', action = 'store_true', help = 'write the records as the workers finish instead of in input order')
+	arguments = parser.parse_args()
+
+	rows = cols = None
+	if(arguments.dimensions is not None):
+		dimensions = BoardInput.parseDimensions(arguments.dimensions)
+		if(dimensions is None):
+			parser.error('dimensions must be given as rowsxcols, for example 3x4')
+		rows, cols = dimensions
+
+	try:
+		if(arguments.workers is None and arguments.timeout is None and arguments.memory_limit is None):
+			batchSolver = BatchSolver(arguments.engine, rows, cols)
+		else:
+			batchSolver = BatchPool(arguments.engine, rows, cols, arguments.workers, arguments.timeout, arguments.memory_limit, not arguments.unordered)
+	except ValueError as error:
+		parser.error(str(error))
+
+	inputFile = sys.stdin if arguments.input == '-' else open(arguments.input)
+	outputFile = sys.stdout if arguments.output == '-' else open(arguments.output, 'w')
+	try:
+		BatchSolver.writeRecords(batchSolver.solveAll(inputFile), outputFile)
+	finally:
+		if(inputFile is not sys.stdin):
+			inputFile.close()
+		if(outputFile is not sys.stdout):
+			outputFile.close()
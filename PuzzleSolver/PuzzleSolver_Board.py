@@ -0,0 +1,199 @@
+"""
+Readme:
+- This Python script contains the board representation shared by the BFS, IDS and AStar puzzle solvers.
+- A puzzle board is packed into a single integer so that two boards can be compared and hashed in constant time.
+- The tables that depend on the size of the board (moves, goal positions, Manhattan distances) are built once per size and shared.
+"""
+
+#!/usr/bin/python3
+import math
+
+class BoardEncoding:
+	'This class packs a puzzle board into an integer and reads/updates the tiles of a packed board'
+	'''
+	Every cell of the board takes bitsPerTile bits of the integer. Cell (i, j) is stored at index i * cols + j,
+	so the 15-puzzle fits in a 64-bit integer with 4 bits per tile.
+	The blank (-1 on the board) is stored as 0, so moving a tile into the blank is a single xor of the tile value.
+	'''
+
+	def bitsPerTile(numCells):
+		'''
+		This method returns the number of bits needed to store the largest tile of a board with numCells cells
+		'''
+		return max(1, (numCells - 1).bit_length())
+
+	def pack(puzzleBoard):
+		'''
+		This method packs a list-of-lists puzzle board into an integer
+		'''
+		bits = BoardEncoding.bitsPerTile(len(puzzleBoard) * len(puzzleBoard[0]))
+		state = 0
+		shift = 0
+		for row in puzzleBoard:
+			for cell in row:
+				if(cell != -1):
+					state |= cell << shift
+				shift += bits
+		return state
+
+	def unpack(state, rows, cols):
+		'''
+		This method converts a packed state back to a list-of-lists puzzle board with -1 as the blank
+		'''
+		bits = BoardEncoding.bitsPerTile(rows * cols)
+		mask = (1 << bits) - 1
+		puzzleBoard = []
+		for i in range(rows):
+			temp = []
+			for j in range(cols):
+				tile = state & mask
+				temp.append(tile if tile else -1)
+				state >>= bits
+			puzzleBoard.append(temp)
+		return puzzleBoard
+
+	def tileAt(state, index, bits):
+		'''
+		This method returns the tile stored in the given cell index of a packed state. 0 is the blank
+		'''
+		return (state >> (index * bits)) & ((1 << bits) - 1)
+
+	def moveTile(state, tile, fromIndex, toIndex, bits):
+		'''
+		This method moves a tile from its cell into the blank cell and returns the new packed state
+		'''
+		return state ^ (tile << (fromIndex * bits)) ^ (tile << (toIndex * bits))
+
+class BoardShape:
+	'This class holds the tables that only depend on the dimensions of the board. BoardShape.get returns one shared object per board size'
+	'''
+	rows, cols - dimensions of the board
+	numCells - number of cells of the board, rows * cols
+	bits - number of bits per tile of the packed board
+	cellPosition - cell index -> (row, col) of the cell
+	neighborCell - cell index of the blank -> the cell the blank moves to for each action (0 -> Left, 1 -> Right, 2 -> Up, 3 -> Down),
+	               -1 if the action would take the blank off the board
+	goalBoard - the goal as a rows x cols Matrix - the tiles in order row by row and the blank (-1) in the last cell
+	goalState - the goal packed by BoardEncoding
+	goalCell - tile -> cell of the tile in the goal. Tile 0 is the blank
+	goalTilePos - tile -> (row, col) of the tile in the goal
+	manhattanTable - tile -> cell -> Manhattan distance of the tile in that cell from its goal cell. It is 0 for the blank
+	'''
+
+	shapes = {} #(rows, cols) -> BoardShape
+
+	def __init__(self, rows, cols):
+		self.rows = rows
+		self.cols = cols
+		self.numCells = rows * cols
+		self.bits = BoardEncoding.bitsPerTile(self.numCells)
+		self.cellPosition = tuple(divmod(cell, cols) for cell in range(self.numCells))
+		self.neighborCell = tuple((cell - 1 if y > 0 else -1, cell + 1 if y < cols - 1 else -1, cell - cols if x > 0 else -1, cell + cols if x < rows - 1 else -1)
+							for cell, (x, y) in enumerate(self.cellPosition))
+
+		self.goalBoard = [[x * cols + y + 1 if x * cols + y + 1 < self.numCells else -1 for y in range(cols)] for x in range(rows)]
+		self.goalState = BoardEncoding.pack(self.goalBoard)
+		self.goalCell = (self.numCells - 1,) + tuple(range(self.numCells - 1))
+		self.goalTilePos = tuple(self.cellPosition[cell] for cell in self.goalCell)
+		self.manhattanTable = ((0,) * self.numCells,) + tuple(tuple(abs(goalX - x) + abs(goalY - y) for x, y in self.cellPosition)
+							for goalX, goalY in self.goalTilePos[1:])
+
+	def get(rows, cols):
+		'''
+		This method returns the tables for a board of the given size, building them on first use
+		'''
+		shape = BoardShape.shapes.get((rows, cols))
+		if(shape is None):
+			shape = BoardShape(rows, cols)
+			BoardShape.shapes[(rows, cols)] = shape
+		return shape
+
+class BoardInput:
+	'This class reads puzzle boards in the input format of the solvers'
+	'''
+	A board is given as space separated values, row by row. For the blank, input either b or B. This char will be converted to -1 for solving.
+	For example, a 15-puzzle - 1 2 3 4 5 6 7 8 9 10 B 11 12 13 14 15
+	Only boards that can reach the goal are accepted, half of all the arrangements of the tiles cannot and would make the solvers search the whole
+	reachable space before failing.
+	'''
+
+	def parse(text, rows = None, cols = None):
+		'''
+		This method converts a line of input to a list-of-lists puzzle board of rows x cols.
+		A square board is assumed when the dimensions are not given.
+		Raises ValueError with a message for the user if the input is not a board of that size, or not a board that can be solved
+		'''
+		tokens = text.split()
+		if(rows is None or cols is None):
+			rows = cols = math.isqrt(len(tokens))
+			if(rows < 2 or len(tokens) != rows * cols):
+				raise ValueError('The number of elements does not make a square puzzle board')
+		elif(len(tokens) != rows * cols):
+			raise ValueError('Insufficient elements for a ' + str(rows * cols - 1) + '-Puzzle')
+
+		cells = []
+		for token in tokens:
+			if(token == 'b' or token == 'B'):
+				cells.append(-1)
+			elif(token.isdigit()):
+				cells.append(int(token))
+			else:
+				raise ValueError('Invalid tile ' + token)
+		puzzleBoard = [cells[i * cols : (i + 1) * cols] for i in range(rows)]
+		BoardInput.validate(puzzleBoard)
+		return puzzleBoard
+
+	def validate(puzzleBoard):
+		'''
+		This method checks that a list-of-lists puzzle board holds every tile from 1 to rows * cols - 1 and one blank exactly once,
+		and that the goal can be reached from it. Raises ValueError with a message for the user if not
+		'''
+		numCells = len(puzzleBoard) * len(puzzleBoard[0])
+		seen = [False] * (numCells + 1) #tile -> True once it is found on the board, the blank (-1) is counted at index numCells
+		for row in puzzleBoard:
+			for cell in row:
+				if(cell != -1 and not 1 <= cell < numCells):
+					raise ValueError('Tile ' + str(cell) + ' is out of range for a ' + str(numCells - 1) + '-Puzzle')
+				if(seen[cell]):
+					raise ValueError('Duplicate blank' if cell == -1 else 'Duplicate tile ' + str(cell))
+				seen[cell] = True
+		if(not BoardInput.isSolvable(puzzleBoard)):
+			raise ValueError('The goal cannot be reached from this board')
+
+	def isSolvable(puzzleBoard):
+		'''
+		This method returns True if the goal (tiles in order, blank in the last cell) can be reached from a board holding every tile once.
+		A move of the blank along a row leaves the order of the tiles read row by row unchanged. A move along a column jumps one tile over the
+		cols - 1 tiles in between, which changes the number of inversions (pairs of tiles out of order) by cols - 1 and the row of the blank by one.
+		So when cols is odd the parity of the inversions never changes, and when cols is even the parity of the inversions plus the row of the blank
+		never changes, and it has to match that of the goal
+		'''
+		rows = len(puzzleBoard)
+		cols = len(puzzleBoard[0])
+		tiles = [cell for row in puzzleBoard for cell in row if cell != -1]
+		#count the inversions with a Fenwick tree of the tiles seen so far, to keep large boards fast
+		tree = [0] * (len(tiles) + 1)
+		inversions = 0
+		for seenCount, tile in enumerate(tiles):
+			index = tile
+			while(index > 0):
+				inversions -= tree[index] #tiles seen so far that are smaller
+				index -= index & -index
+			inversions += seenCount
+			index = tile
+			while(index <= len(tiles)):
+				tree[index] += 1
+				index += index & -index
+		if(cols % 2 == 1):
+			return inversions % 2 == 0
+		blankRow = [-1 in row for row in puzzleBoard].index(True)
+		return (inversions + rows - 1 - blankRow) % 2 == 0
+
+	def parseDimensions(argument):
+		'''
+		This method reads board dimensions given as rowsxcols, for example 3x3 or 4x4. Returns (rows, cols), or None if the argument is not in that format
+		'''
+		parts = argument.lower().split('x')
+		if(len(parts) != 2 or not parts[0].isdigit() or not parts[1].isdigit() or int(parts[0]) < 2 or int(parts[1]) < 2):
+			return None
+		return (int(parts[0]), int(parts[1]))
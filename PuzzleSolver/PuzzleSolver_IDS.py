@@ -9,7 +9,7 @@ Readme:
 #!/usr/bin/python3
 import time
 import os
-import copy
+import sys
 
 try:
     import psutil  # for computing memory usage
@@ -18,39 +18,24 @@ except ImportError:  # try to install requests module if not present
     os.system('sudo python -m pip install psutil')
 import psutil
 
+from PuzzleSolver_Board import BoardEncoding, BoardInput, BoardShape
+from PuzzleSolver_Stats import SearchStatistics
+
 #All variables are passed by reference in Python
 class IDS:
 	'This class contains an implementation of the Iterative Deepening Depth-first Search algorithm'
 	
 	def moveBlank(node, action):
 		'''
-		This function swaps the blank cell and the nearby cell based on the action given in input argument
-		It returns a new child node with the new configuration
+		This function slides the tile next to the blank, in the direction given by the action, into the blank cell
+		It returns a new child node with the new configuration, or None if the action would take the blank off the board
 		'''
-		#to retain the original reference to a node, this temporary node is created
-		tNode = PuzzleBoardNode(copy.deepcopy(node.puzzleBoard), node, action, XYPos(node.blankPosition.x, node.blankPosition.y))
-		if(action == 0):
-			#Left
-			if(tNode.blankPosition.y > 0):				
-				tNode.blankPosition.y -= 1
-		elif(action == 1):
-			#Right
-			if(tNode.blankPosition.y < (len(tNode.puzzleBoard[0]) - 1)):
-				tNode.blankPosition.y += 1
-		elif(action == 2):
-			#Up
-			if(tNode.blankPosition.x > 0):
-				tNode.blankPosition.x -= 1
-		elif(action == 3):
-			#Down
-			if(tNode.blankPosition.x < (len(tNode.puzzleBoard) - 1)):
-				tNode.blankPosition.x += 1
-
-		#swap the nearby value cell and the blank cell
-		tNode.puzzleBoard[node.blankPosition.x][node.blankPosition.y] = tNode.puzzleBoard[tNode.blankPosition.x][tNode.blankPosition.y]
-		tNode.puzzleBoard[tNode.blankPosition.x][tNode.blankPosition.y] = -1
-
-		return tNode
+		#the board of the parent is never copied, the child gets a new packed state with the one tile moved
+		newBlankIndex = node.shape.neighborCell[node.blankIndex][action]
+		if(newBlankIndex == -1):
+			return None
+		tile = BoardEncoding.tileAt(node.state, newBlankIndex, node.shape.bits)
+		return PuzzleBoardNode(BoardEncoding.moveTile(node.state, tile, newBlankIndex, node.blankIndex, node.shape.bits), node.shape, node, action, newBlankIndex)
 
 	def traceSolution(solution, tNode):
 		'''
@@ -61,63 +46,114 @@ class IDS:
 			solution.append(tNode.actionTaken)
 			IDS.traceSolution(solution, tNode.parentNode)
 
-	def dls(node, goalNode, actions, limit, exploredNodes):
+	def dls(node, goalNode, actions, limit, exploredNodes, statistics, verbose = True):
 		'''
 			The dls method takes the complete initial state of the puzzle board (the root) as the argument.
+			The nodes generated and expanded are counted in statistics.
 			Returns a solution array with the sequence of actions to go from the initial state to a goal state. 
 		'''
 		solution = []
 		#goal test
 		if(node == goalNode):
-			print('Goal found')
-			node.print()
+			if(verbose):
+				print('Goal found')
+				node.print()
 			IDS.traceSolution(solution, node)
 			return solution
 		elif(limit == 0):
 			#print('cutoff reached')
 			return []
 		else:
+			statistics.nodesExpanded += 1
 			exploredNodes.append(node) #add current node to explored set
 			for action in actions:
 				tNode = IDS.moveBlank(node, action) #move the blank to the next position
+				if(tNode is None):
+					continue
+				statistics.nodesGenerated += 1
 				if(tNode not in exploredNodes):
 					exploredNodes.append(tNode)		#if its an unexplored node, then explore it and add it to the set.
-					solution = IDS.dls(tNode, goalNode, actions, limit - 1, exploredNodes)  #call the dls method recursively with decremented depth limit
+					solution = IDS.dls(tNode, goalNode, actions, limit - 1, exploredNodes, statistics, verbose)  #call the dls method recursively with decremented depth limit
 					if(len(solution) != 0):		#if solution is found then break from the loop
 						break
+				else:
+					statistics.nodesDeduplicated += 1
 		return solution
 
-class XYPos:
-	'(x, y) coordinate representation class'
+	def ids(puzzleBoardNode, goalNode, actions, verbose = True):
+		'''
+			The ids method takes the complete initial state of the puzzle board (the root) as the argument and calls the dls method with increasing depth limits.
+			If verbose, the time taken and memory used are printed for each depth.
+			Returns a tuple with the solution array with the sequence of actions to go from the initial state to a goal state, some time/memory statistics
+			and the SearchStatistics of the run, broken down by depth limit. 
+		'''
+		solution = []
+		statistics = SearchStatistics('ids', 'depth')
+		depth = 0
+		time1 = time.time() #start time
+		try:
+			while(len(solution) == 0 and puzzleBoardNode != goalNode):
+				statistics.enterLayer(depth)
+				depthTime1 = time.time()
+				exploredNodes = []
+				solution = IDS.dls(puzzleBoardNode, goalNode, actions, depth, exploredNodes, statistics, verbose)
+				#the search is depth-first, so at most one path of depth nodes waits to be expanded
+				statistics.peakFrontier = depth
+				statistics.peakClosed = max(statistics.peakClosed, len(exploredNodes))
+				if(verbose):
+					depthTime2 = time.time()
+					process = psutil.Process(os.getpid())
+					#print the time taken and memory used for the above call for each depth
+					print('For depth', depth)
+					print('Elapsed Time - ', (depthTime2 - depthTime1), 'seconds')
+					print('Physical Memory Used - ', process.memory_info().rss/1000000, 'MB')
+					print('Virtual Memory Used - ', process.memory_info().vms/1000000, 'MB')
+				depth += 1
+		except MemoryError:
+			print('Failure - Ran out of memory!')
+		else:
+			time2 = time.time()
+			runningTime = (time2 - time1) #calculates the elapsed time
+			process = psutil.Process(os.getpid())
+			pMemoryUsed = process.memory_info().rss/1000000 #This retrieves the physical memory allocated
+			vMemoryUsed = process.memory_info().vms/1000000 #This retrieves the virtual memory allocated
+			statistics.finish(pMemoryUsed)
 
-	def __init__(self, x, y):
-		self.x = x
-		self.y = y
+		return (solution, runningTime, pMemoryUsed, vMemoryUsed, statistics)
 
 class PuzzleBoardNode:
 	'This class is used to represent a particular state of the puzzle board'
 	'''
-	puzzleBoard - a 4 x 4 Matrix
+	state - the board packed into an integer by BoardEncoding
+	shape - object of type BoardShape with the dimensions and move tables of the board. Shared by all the nodes of a search
 	parentNode - object of type PuzzleBoardNode. Used to traceback the path to root. For root, this is None.
 	actionTaken - The action taken to reach this node. -1 for root node
-	blankPosition - a data object to track where the blank cell is in the board
+	blankIndex - the cell (row * cols + col) where the blank is on the board
 	'''
 
-	def __init__(self, puzzleBoard, parent, action, blankPosition):
-		self.puzzleBoard = puzzleBoard
+	def __init__(self, state, shape, parent, action, blankIndex):
+		self.state = state
+		self.shape = shape
 		self.parentNode = parent
 		self.actionTaken = action
-		self.blankPosition = blankPosition
+		self.blankIndex = blankIndex
+
+	def fromBoard(puzzleBoard):
+		'''
+		This method creates a root node from a list-of-lists puzzle board with -1 as the blank
+		'''
+		cells = [cell for row in puzzleBoard for cell in row]
+		return PuzzleBoardNode(BoardEncoding.pack(puzzleBoard), BoardShape.get(len(puzzleBoard), len(puzzleBoard[0])), None, -1, cells.index(-1))
 
 	def __eq__(self, puzzleBoardNode):
 		#checks if two puzzle boards have the same configuration and can be used to check if a node is visited or not(just check if a node equals any in frontier or explored set)
-		return not((self.puzzleBoard > puzzleBoardNode.puzzleBoard) - (self.puzzleBoard < puzzleBoardNode.puzzleBoard)) #python3 workaround for cmp()
+		return self.state == puzzleBoardNode.state
 
-	def __hash__(self): #this has to be implemented since __eq__ has been overridden
-		return id(self)	
+	def __hash__(self): #hashes on the board configuration so that equal boards land in the same set/dict slot
+		return hash(self.state)
 	
 	def print(self):
-		for row in self.puzzleBoard:
+		for row in BoardEncoding.unpack(self.state, self.shape.rows, self.shape.cols):
 			for cell in row:
 				print(cell, end = " ")
 			print("\n")
@@ -135,32 +171,12 @@ class FifteenPuzzle:
 		self.puzzleBoardRoot = puzzleBoardRoot
 		self.goalNode = goalNode
 		self.actions = actions
-		self.solution = []
 
 	def forwardSearch(self):
 		'''
-			This method calls the dls method and passes the current state of the puzzle board.
+			This method calls the ids method and passes the current state of the puzzle board.
 		'''
-		depth = 0
-		while(len(self.solution) == 0):
-			try:
-				time1 = time.time() #start time			
-				self.solution = IDS.dls(self.puzzleBoardRoot, self.goalNode, self.actions, depth, [])
-			except MemoryError:
-				print('Failure - Ran out of memory!')
-			else:
-				time2 = time.time() #end time
-				runningTime = (time2 - time1) #calculates the elapsed time
-				process = psutil.Process(os.getpid())
-				pMemoryUsed = process.memory_info().rss/1000000 #This retrieves the physical memory allocated
-				vMemoryUsed = process.memory_info().vms/1000000 #This retrieves the virtual memory allocated
-				#print the time taken and memory used for the above call for each depth
-				print('For depth', depth)
-				print('Elapsed Time - ', runningTime, 'seconds') #I think this already prints the time taken for each depth value - check once
-				print('Physical Memory Used - ', pMemoryUsed, 'MB')
-				print('Virtual Memory Used - ', vMemoryUsed, 'MB')
-			depth += 1
-
+		self.solution = IDS.ids(self.puzzleBoardRoot, self.goalNode, self.actions)
 		self.printSolution()
 
 	def printSolution(self):
@@ -169,13 +185,13 @@ class FifteenPuzzle:
 			If no failure and the solution array ends, then print goal state found else failure.
 		'''
 		
-		if(len(self.solution) == 0):
+		if(len(self.solution[0]) == 0):
 			print('Failure - No Solution is available')
 		else:
-			print('Depth of the solution - ', len(self.solution))
+			print('Depth of the solution - ', len(self.solution[0]))
 			print('Sequence of actions to reach the goal state from root is :')
-			self.solution.reverse()
-			for action in self.solution:
+			self.solution[0].reverse()
+			for action in self.solution[0]:
 				if(action == 0):
 					print('Left')
 				elif(action == 1):
@@ -185,42 +201,39 @@ class FifteenPuzzle:
 				elif(action == 3):
 					print('Down')
 
+		print('Elapsed Time - ', self.solution[1], 'seconds')
+		print('Physical Memory Used - ', self.solution[2], 'MB')
+		print('Virtual Memory Used - ', self.solution[3], 'MB')
+		self.solution[4].print()
+
 if (__name__ == '__main__'):
-	print("Enter the 15-puzzle input as a space seperated values. For the blank, input either b or B. This char will be converted to -1 for solving")
+	print("Enter the puzzle input as a space seperated values, row by row. For the blank, input either b or B. This char will be converted to -1 for solving")
 	'''
 	User must provide input in the format - 1 2 3 4 5 6 7 8 9 10 B 11 12 13 14 15
+	Square boards of any size (8-puzzle, 15-puzzle, 24-puzzle ...) are recognized from the number of values.
+	For other boards give the dimensions as an argument, for example - python PuzzleSolver_IDS.py 3x4
 	'''
 	
-	initialState = []
-	temp = []
+	dimensions = (None, None)
+	for argument in sys.argv[1:]:
+		if(BoardInput.parseDimensions(argument) is not None):
+			dimensions = BoardInput.parseDimensions(argument)
 
 	#Read the input from console
 	while(True):
-		rawInput = input('Enter input here : ').split(' ')
-
-		if(len(rawInput) != 16):
-			print('Insufficient elements for a 15-Puzzle. Re-enter input!')
+		try:
+			initialState = BoardInput.parse(input('Enter input here : '), dimensions[0], dimensions[1])
+		except ValueError as error:
+			print(str(error) + '. Re-enter input!')
 			continue
 
-		rawInputIndex = 0
-		for i in range(4):
-			temp = []
-			for j in range(4):
-				if(rawInput[rawInputIndex] == 'b' or rawInput[rawInputIndex] == 'B'):
-					temp.append(-1)
-					xy = XYPos(i, j)
-				else:
-					temp.append(int(rawInput[rawInputIndex]))
-				rawInputIndex += 1
-			initialState.append(temp)
-		
-		goalState = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, -1]]
+		shape = BoardShape.get(len(initialState), len(initialState[0]))
 		#Action sequence - Up, Down, Left, Right
 		actions = [2, 3, 0, 1]
 
 		#Formulating the root and goal nodes
-		root = PuzzleBoardNode(initialState, None, -1, xy)
-		goal = PuzzleBoardNode(goalState, None, -1, XYPos(3, 3))
+		root = PuzzleBoardNode.fromBoard(initialState)
+		goal = PuzzleBoardNode.fromBoard(shape.goalBoard)
 
 		print('Initial State')
 		root.print()
@@ -0,0 +1,187 @@
+"""
+Readme:
+- This Python script builds and loads disjoint additive pattern databases, a heuristic for the AStar solvers that is much tighter than the Manhattan distance.
+- The tiles are split into disjoint groups (a partition). For every group, a retrograde breadth-first search from the goal counts the moves of that
+  group's tiles needed to place them, ignoring the other tiles. Since every move moves the tile of a single group, the per-group values can be added.
+- Each table is saved to disk as a byte array (one byte per entry) and memory-mapped when loaded, so it is built once and shared between runs.
+- To precompute the tables run - python PuzzleSolver_PatternDB.py 663 (or 555). The 6-6-3 tables take a few minutes to build, the 5-5-5 ones well under a minute.
+"""
+
+#!/usr/bin/python3
+import mmap
+import os
+import sys
+import time
+
+from PuzzleSolver_Board import BoardEncoding, BoardShape
+
+class PatternDatabase:
+	'This class holds the tables of a disjoint additive pattern database and sums them up to get the heuristic value of a board'
+	'''
+	rows, cols - dimensions of the board
+	partition - list of disjoint tile groups, each a list of tile numbers
+	tables - one byte array (or memory map of one) per tile group, indexed by the cells of the group's tiles
+	In the goal, tile t is at cell t - 1 and the blank is in the last cell.
+	A table entry for the tiles (t0, t1, ...) at cells (c0, c1, ...) is at index c0 + (c1 << bits) + (c2 << 2 * bits) ..., where bits is the
+	number of bits per cell of the packed board. This leaves some entries unused but needs only shifts to compute during the search.
+	'''
+
+	#commonly used partitions of the 15-puzzle
+	PARTITIONS = {
+		'663' : [[1, 5, 6, 9, 10, 13], [7, 8, 11, 12, 14, 15], [2, 3, 4]],
+		'555' : [[1, 2, 3, 5, 6], [4, 7, 8, 11, 12], [9, 10, 13, 14, 15]],
+	}
+
+	def __init__(self, rows, cols, partition, tables):
+		self.rows = rows
+		self.cols = cols
+		self.partition = partition
+		self.tables = tables
+		self.bits = BoardEncoding.bitsPerTile(rows * cols)
+
+	def distance(self, state):
+		'''
+		This method returns the heuristic value of a packed board - the sum of the table entries of all the tile groups
+		'''
+		bits = self.bits
+		mask = (1 << bits) - 1
+		tileCell = [0] * (self.rows * self.cols)
+		for cell in range(self.rows * self.cols):
+			tileCell[state & mask] = cell
+			state >>= bits
+
+		total = 0
+		for tiles, table in zip(self.partition, self.tables):
+			index = 0
+			shift = 0
+			for tile in tiles:
+				index |= tileCell[tile] << shift
+				shift += bits
+			total += table[index]
+		return total
+
+	def fileName(directory, rows, cols, tiles):
+		'''
+		This method returns the path of the table file of a tile group
+		'''
+		return os.path.join(directory, 'pdb_' + str(rows) + 'x' + str(cols) + '_' + '-'.join(str(tile) for tile in tiles) + '.bin')
+
+	def buildTable(rows, cols, tiles):
+		'''
+		This method runs the retrograde breadth-first search from the goal for one tile group and returns its table as a bytearray.
+		The search state is the cells of the group's tiles plus the cell of the blank. Moving the blank over a tile outside the group costs 0,
+		moving one of the group's tiles costs 1, so the search runs one cost layer at a time and fills the zero cost moves of a layer with a stack.
+		'''
+		shape = BoardShape.get(rows, cols)
+		numCells = shape.numCells
+		bits = shape.bits
+		mask = (1 << bits) - 1
+		blankShift = bits * len(tiles)
+		patternMask = (1 << blankShift) - 1
+		neighbors = [[cell for cell in neighborCell if cell != -1] for neighborCell in shape.neighborCell]
+
+		table = bytearray(b'\xff') * (1 << blankShift) #255 marks a placement that has not been reached yet
+		visited = bytearray(((1 << (blankShift + bits)) >> 3) + 1) #one bit per search state
+
+		start = (numCells - 1) << blankShift
+		for i, tile in enumerate(tiles):
+			start |= (tile - 1) << (bits * i)
+
+		currentLayer = [start]
+		distance = 0
+		while(len(currentLayer) != 0):
+			stack = []
+			for s in currentLayer:
+				if(not (visited[s >> 3] >> (s & 7)) & 1):
+					visited[s >> 3] |= 1 << (s & 7)
+					stack.append(s)
+
+			nextLayer = []
+			while(len(stack) != 0):
+				s = stack.pop()
+				pattern = s & patternMask
+				blank = s >> blankShift
+				if(table[pattern] == 255):
+					table[pattern] = distance #layers are searched in order of cost, so the first visit is the cheapest
+
+				#cell -> position of the tile in the group, for the cells holding the group's tiles
+				occupied = {}
+				p = pattern
+				for i in range(len(tiles)):
+					occupied[p & mask] = i
+					p >>= bits
+
+				for cell in neighbors[blank]:
+					i = occupied.get(cell)
+					if(i is None):
+						#blank moves over a tile outside the group - same cost layer
+						ns = pattern | (cell << blankShift)
+						if(not (visited[ns >> 3] >> (ns & 7)) & 1):
+							visited[ns >> 3] |= 1 << (ns & 7)
+							stack.append(ns)
+					else:
+						#one of the group's tiles moves into the blank - next cost layer
+						ns = (pattern ^ (cell << (bits * i)) ^ (blank << (bits * i))) | (cell << blankShift)
+						if(not (visited[ns >> 3] >> (ns & 7)) & 1):
+							nextLayer.append(ns)
+
+			currentLayer = nextLayer
+			distance += 1
+
+		return table
+
+	def build(directory, rows, cols, partition):
+		'''
+		This method builds the tables of all the tile groups of the partition and saves them in the given directory
+		'''
+		os.makedirs(directory, exist_ok = True)
+		for tiles in partition:
+			time1 = time.time()
+			table = PatternDatabase.buildTable(rows, cols, tiles)
+			#write to a temporary file first so that an interrupted build never leaves a truncated table behind
+			path = PatternDatabase.fileName(directory, rows, cols, tiles)
+			with open(path + '.tmp', 'wb') as f:
+				f.write(table)
+			os.replace(path + '.tmp', path)
+			print('Pattern database for tiles', tiles, 'built in', time.time() - time1, 'seconds')
+
+	def load(directory, rows, cols, partition):
+		'''
+		This method memory-maps the saved tables of the partition read-only and returns the pattern database.
+		Returns None if any of the tables has not been built
+		'''
+		tables = []
+		for tiles in partition:
+			path = PatternDatabase.fileName(directory, rows, cols, tiles)
+			if(not os.path.exists(path)):
+				return None
+			with open(path, 'rb') as f:
+				tables.append(mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ))
+		return PatternDatabase(rows, cols, partition, tables)
+
+	def loadOrBuild(directory, rows, cols, partition):
+		'''
+		This method loads the saved tables of the partition, building and saving them first if they are missing
+		'''
+		patternDatabase = PatternDatabase.load(directory, rows, cols, partition)
+		if(patternDatabase is None):
+			PatternDatabase.build(directory, rows, cols, partition)
+			patternDatabase = PatternDatabase.load(directory, rows, cols, partition)
+		return patternDatabase
+
+	def defaultDirectory():
+		'''
+		This method returns the directory the tables are saved in when none is given - patterndb next to this script
+		'''
+		return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patterndb')
+
+if (__name__ == '__main__'):
+	'''
+	Usage - python PuzzleSolver_PatternDB.py [663|555] [directory]
+	'''
+	partitionName = sys.argv[1] if len(sys.argv) > 1 else '663'
+	directory = sys.argv[2] if len(sys.argv) > 2 else PatternDatabase.defaultDirectory()
+	if(partitionName not in PatternDatabase.PARTITIONS):
+		print('Unknown partition', partitionName, '- choose one of', ', '.join(PatternDatabase.PARTITIONS))
+		sys.exit(1)
+	PatternDatabase.build(directory, 4, 4, PatternDatabase.PARTITIONS[partitionName])
@@ -0,0 +1,108 @@
+"""
+Readme:
+- This Python script contains the statistics that every search engine collects while it runs and returns along with its solution.
+- The counters are plain attributes bumped by the engines, and the per-layer breakdown is taken from the running totals at the layer
+  boundaries only, so the statistics are cheap enough to be always on.
+- A run is exported with toDict/toJson, to compare runs for regressions and to size the memory needed for harder boards.
+"""
+
+#!/usr/bin/python3
+import json
+import time
+
+class SearchStatistics:
+	'This class holds the node counts, frontier sizes and timings of one search run'
+	'''
+	engine - name of the search engine
+	layerKind - what a layer of the breakdown is - 'depth' (BFS, IDS), 'threshold' (IDA*) or 'cost' (A*, the total cost of the expanded nodes)
+	nodesGenerated - child nodes created by the move generator
+	nodesExpanded - nodes whose children were generated
+	nodesDeduplicated - generated nodes dropped because their state was already explored or queued
+	peakFrontier - largest number of nodes waiting to be expanded at one time. For the depth-first searches, the longest path
+	peakClosed - largest number of states kept to detect repeated states
+	layers - list of dictionaries with the key of each layer and the nodes generated, expanded and the seconds spent in it
+	moveTime, heuristicTime, queueTime - seconds spent generating moves, evaluating the heuristic and on the frontier/explored set,
+	                                     or None if the engine does not measure them (the depth-first searches interleave them too finely)
+	runningTime - seconds from start to finish
+	physicalMemory - physical memory used by the process at the end of the search, in MB
+	'''
+
+	def __init__(self, engine, layerKind):
+		self.engine = engine
+		self.layerKind = layerKind
+		self.nodesGenerated = 0
+		self.nodesExpanded = 0
+		self.nodesDeduplicated = 0
+		self.peakFrontier = 0
+		self.peakClosed = 0
+		self.layers = []
+		self.moveTime = None
+		self.heuristicTime = None
+		self.queueTime = None
+		self.runningTime = 0
+		self.physicalMemory = None
+		self.layerKey = None
+		self.startTime = time.perf_counter()
+		self.layerMark = (self.startTime, 0, 0) #time, generated and expanded at the start of the current layer
+
+	def startTimers(self):
+		'''
+		This method is called by the engines that measure the time spent on move generation, heuristic and queue operations
+		'''
+		self.moveTime = 0.0
+		self.heuristicTime = 0.0
+		self.queueTime = 0.0
+
+	def enterLayer(self, key):
+		'''
+		This method closes the current layer, if any, and starts a new one with the given key
+		'''
+		now = time.perf_counter()
+		if(self.layerKey is not None):
+			markTime, markGenerated, markExpanded = self.layerMark
+			self.layers.append({self.layerKind : self.layerKey, 'generated' : self.nodesGenerated - markGenerated,
+								'expanded' : self.nodesExpanded - markExpanded, 'time' : now - markTime})
+		self.layerKey = key
+		self.layerMark = (now, self.nodesGenerated, self.nodesExpanded)
+
+	def finish(self, physicalMemory = None):
+		'''
+		This method closes the last layer and records the running time and memory at the end of the search
+		'''
+		self.enterLayer(None)
+		self.runningTime = time.perf_counter() - self.startTime
+		self.physicalMemory = physicalMemory
+
+	def nodesPerSecond(self):
+		return self.nodesGenerated / self.runningTime if self.runningTime > 0 else 0.0
+
+	def toDict(self):
+		'''
+		This method returns the statistics as a dictionary of JSON types
+		'''
+		timings = None
+		if(self.moveTime is not None):
+			timings = {'moveGeneration' : self.moveTime, 'heuristic' : self.heuristicTime, 'queue' : self.queueTime}
+		return {
+			'engine' : self.engine,
+			'nodesGenerated' : self.nodesGenerated,
+			'nodesExpanded' : self.nodesExpanded,
+			'nodesDeduplicated' : self.nodesDeduplicated,
+			'peakFrontier' : self.peakFrontier,
+			'peakClosed' : self.peakClosed,
+			'nodesPerSecond' : self.nodesPerSecond(),
+			'runningTime' : self.runningTime,
+			'physicalMemory' : self.physicalMemory,
+			'timings' : timings,
+			'layers' : self.layers,
+		}
+
+	def toJson(self):
+		return json.dumps(self.toDict())
+
+	def print(self):
+		print('Nodes Generated - ', self.nodesGenerated, 'Expanded - ', self.nodesExpanded, 'Deduplicated - ', self.nodesDeduplicated)
+		print('Peak Frontier Size - ', self.peakFrontier, 'Peak Closed Set Size - ', self.peakClosed)
+		print('Nodes per Second - ', self.nodesPerSecond())
+		if(self.moveTime is not None):
+			print('Move Generation Time - ', self.moveTime, 'Heuristic Time - ', self.heuristicTime, 'Queue Time - ', self.queueTime, 'seconds')